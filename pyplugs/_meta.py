@@ -0,0 +1,37 @@
+"""Metadata about PyPlugs
+
+Information about the homepage and maintainers of PyPlugs. This is computed once,
+when PyPlugs is imported.
+"""
+
+# Standard library imports
+from collections import namedtuple
+from datetime import date
+
+# Homepage for PyPlugs
+__url__ = "https://pyplugs.readthedocs.io/"
+
+
+# Authors/maintainers of PyPlugs
+_Author = namedtuple("_Author", ["name", "email", "start", "end"])
+_AUTHORS = [
+    _Author("Geir Arne Hjelle", "geirarne@gmail.com", date(2019, 4, 1), date.max)
+]
+_today = date.today()
+_active = tuple(a for a in _AUTHORS if a.start < _today < a.end)
+
+__author__ = ", ".join(a.name for a in _active)
+__contact__ = ", ".join(a.email for a in _active)
+
+
+# Doc-string for PyPlugs, with info about maintainers
+_maintainers = "\n".join(f"+ {a.name} <{a.email}>" for a in _active)
+PACKAGE_DOC = f"""PyPlugs, decorator based plug-in architecture for Python
+
+See {__url__} for more information.
+
+Current maintainers:
+--------------------
+
+{_maintainers}
+"""
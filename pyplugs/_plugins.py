@@ -3,34 +3,33 @@
 """
 
 # Standard library imports
-import functools
+import hashlib
 import importlib
+import importlib.util
+import json
+import os
+import pathlib
+import pkgutil
 import sys
 import textwrap
+from dataclasses import dataclass, fields
 from typing import (
     Any,
     Callable,
     Dict,
     List,
-    NamedTuple,
     Optional,
+    Sequence,
     Set,
+    Tuple,
     TypeVar,
     overload,
 )
 
 # PyPlugs imports
+import pyplugs
 from pyplugs import _exceptions
 
-# Use backport of importlib.resources if necessary
-try:
-    # Standard library imports
-    from importlib import resources
-except ImportError:  # pragma: nocover
-    # Third party imports
-    import importlib_resources as resources  # type: ignore
-
-
 # Type aliases
 T = TypeVar("T")
 Plugin = Callable[..., Any]
@@ -47,22 +46,127 @@ def expose(func: Callable[..., T]) -> Callable[..., T]:
 
 
 @expose
-class PluginInfo(NamedTuple):
+@dataclass(frozen=True)
+class PluginInfo:
     """Information about one plug-in"""
 
+    __slots__ = (
+        "package_name",
+        "plugin_name",
+        "func_name",
+        "func",
+        "sort_value",
+        "label",
+        "_doc_parts",
+    )
+
     package_name: str
     plugin_name: str
     func_name: str
     func: Plugin
-    description: str
-    doc: str
-    module_doc: str
     sort_value: float
     label: Optional[str]
 
-
-# Dictionary with information about all registered plug-ins
-_PLUGINS: Dict[str, Dict[str, Dict[str, PluginInfo]]] = {}
+    @property
+    def description(self) -> str:
+        """First paragraph of the doc-string of the plug-in function"""
+        return self._parsed_doc()[0]
+
+    @property
+    def doc(self) -> str:
+        """Rest of the doc-string of the plug-in function"""
+        return self._parsed_doc()[1]
+
+    @property
+    def module_doc(self) -> str:
+        """Doc-string of the module containing the plug-in function"""
+        module = sys.modules.get(self.func.__module__)
+        return getattr(module, "__doc__", None) or ""
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Copy and pickle the fields, but not the cached doc-string parts"""
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the fields of a copied or unpickled plug-in"""
+        for name, value in state.items():
+            object.__setattr__(self, name, value)  # Bypass frozen
+
+    def _parsed_doc(self) -> Tuple[str, str]:
+        """Parse the doc-string of the plug-in function the first time it's used"""
+        doc_parts: Optional[Tuple[str, str]] = getattr(self, "_doc_parts", None)
+        if doc_parts is None:
+            doc_parts = _parse_doc(self.func.__doc__ or "")
+            object.__setattr__(self, "_doc_parts", doc_parts)  # Bypass frozen
+        return doc_parts
+
+
+def _parse_doc(doc: str) -> Tuple[str, str]:
+    """Split a doc-string into a description and a dedented body
+
+    The doc-strings are only parsed when they are first asked for, so that
+    registering plug-ins stays cheap.
+    """
+    split = doc.find("\n\n")
+    if split < 0:
+        return doc, ""  # Single paragraph doc-strings have no body to dedent
+    return doc[:split], _dedent(doc[split:])
+
+
+def _dedent(text: str) -> str:
+    """Remove common leading spaces from all lines in a text, and strip it
+
+    Doc-strings are usually indented with spaces, so this does the same job as
+    textwrap.dedent() without its regular expressions. Texts containing tabs are
+    still handed to textwrap.dedent().
+    """
+    stripped = text.strip()
+    if "\n" not in stripped:
+        return stripped  # Nothing to dedent in a single line
+    if "\t" in text:
+        return textwrap.dedent(text).strip()
+
+    lines = text.split("\n")
+    indent = min(
+        (len(line) - len(line.lstrip(" ")) for line in lines if line.strip()),
+        default=0,
+    )
+    return "\n".join(line[indent:] if line.strip() else "" for line in lines).strip()
+
+
+# Information about all registered plug-ins, indexed by (package, plugin, function)
+_PLUGINS: Dict[Tuple[str, str, str], PluginInfo] = {}
+
+# Names of the registered functions in each (package, plugin), in registration order
+_BY_PLUGIN: Dict[Tuple[str, str], List[str]] = {}
+
+# Names of the registered functions in each (package, plugin), grouped by label
+_BY_LABEL: Dict[Tuple[str, str], Dict[Optional[str], List[str]]] = {}
+
+# Plug-ins that have already been imported, used to avoid repeated imports
+_IMPORTED: Set[Tuple[str, str]] = set()
+
+# Packages where all plug-ins have already been imported
+_IMPORTED_PACKAGES: Set[str] = set()
+
+# Names of plug-in files found in each package, discovered without importing them
+_CANDIDATES: Dict[str, List[str]] = {}
+
+# Names of the plug-ins in each package, sorted by sort_value
+_NAMES_CACHE: Dict[str, Tuple[str, ...]] = {}
+
+# Package and plug-in names of each module that has registered functions
+_MODULE_NAMES: Dict[str, Tuple[str, str]] = {}
+
+# Plug-in functions already looked up by get() and call()
+_FUNC_CACHE: Dict[Tuple[str, str, Optional[str], Optional[str]], Plugin] = {}
+
+# Directory for caching plug-in information between sessions, disabled by default
+_CACHE_DIR: Optional[pathlib.Path] = (
+    pathlib.Path(os.environ["PYPLUGS_CACHE_DIR"])
+    if os.environ.get("PYPLUGS_CACHE_DIR")
+    else None
+)
 
 
 @overload
@@ -90,24 +194,40 @@ def register(
 
     def decorator_register(func: Callable[..., T]) -> Callable[..., T]:
         """Store information about the given function"""
-        package_name, _, plugin_name = func.__module__.rpartition(".")
-        description, _, doc = (func.__doc__ or "").partition("\n\n")
-        func_name = func.__name__
-        module_doc = sys.modules[func.__module__].__doc__ or ""
-
-        pkg_info = _PLUGINS.setdefault(package_name, {})
-        plugin_info = pkg_info.setdefault(plugin_name, {})
-        plugin_info[func_name] = PluginInfo(
+        # Intern names so all copies of the same name share one string object
+        try:
+            plugin_key = _MODULE_NAMES[func.__module__]
+        except KeyError:
+            package_name, _, plugin_name = func.__module__.rpartition(".")
+            plugin_key = (sys.intern(package_name), sys.intern(plugin_name))
+            _MODULE_NAMES[func.__module__] = plugin_key
+        package_name, plugin_name = plugin_key
+        func_name = sys.intern(func.__name__)
+
+        key = (package_name, plugin_name, func_name)
+        previous = _PLUGINS.get(key)
+        _PLUGINS[key] = PluginInfo(
             package_name=package_name,
             plugin_name=plugin_name,
             func_name=func_name,
             func=func,
-            description=description,
-            doc=textwrap.dedent(doc).strip(),
-            module_doc=module_doc,
             sort_value=sort_value,
             label=label,
         )
+        if previous is None:
+            try:
+                _BY_PLUGIN[plugin_key].append(func_name)
+            except KeyError:
+                _BY_PLUGIN[plugin_key] = [func_name]
+            _BY_LABEL.setdefault(plugin_key, {}).setdefault(label, []).append(func_name)
+        elif previous.label != label:
+            # Regroup to keep the functions with the new label in registration order
+            _BY_LABEL[plugin_key] = _group_by_label(package_name, plugin_name)
+        _IMPORTED.add(plugin_key)
+
+        # Forget cached lookups that may be affected by the new function
+        _FUNC_CACHE.clear()
+        _NAMES_CACHE.pop(package_name, None)
         return func
 
     if _func is None:
@@ -116,27 +236,44 @@ def register(
         return decorator_register(_func)
 
 
+def _group_by_label(package: str, plugin: str) -> Dict[Optional[str], List[str]]:
+    """Group the functions in a plug-in by their labels"""
+    grouped: Dict[Optional[str], List[str]] = {}
+    for func_name in _BY_PLUGIN[(package, plugin)]:
+        label = _PLUGINS[(package, plugin, func_name)].label
+        grouped.setdefault(label, []).append(func_name)
+    return grouped
+
+
 @expose
-def names(package: str) -> List[str]:
-    """List all plug-ins in one package"""
-    _import_all(package)
-    return sorted(_PLUGINS[package].keys(), key=lambda p: info(package, p).sort_value)
+def names(package: str, lazy: bool = False) -> Sequence[str]:
+    """List all plug-ins in one package
+
+    With lazy=True, list the plug-in files in the package without importing
+    them. The names are then sorted alphabetically instead of by sort_value,
+    and may include files that do not register any plug-in functions.
+    """
+    if lazy:
+        return tuple(sorted(_discover(package)))
+
+    if package not in _NAMES_CACHE:
+        sort_values = _sort_values(package)
+        _NAMES_CACHE[package] = tuple(sorted(sort_values, key=sort_values.__getitem__))
+    return _NAMES_CACHE[package]
 
 
 @expose
 def funcs(package: str, plugin: str, label: Optional[str] = None) -> List[str]:
     """List all functions in one plug-in"""
     _import(package, plugin)
-    plugin_info = _PLUGINS[package][plugin]
-    return [k for k, v in plugin_info.items() if v.label == label]
+    return list(_BY_LABEL[(package, plugin)].get(label, []))
 
 
 @expose
 def labels(package: str, plugin: str) -> Set[str]:
     """List all labels in one plug-in"""
     _import(package, plugin)
-    plugin_info = _PLUGINS[package][plugin]
-    return {p.label for p in plugin_info.values() if p.label is not None}
+    return {label for label in _BY_LABEL[(package, plugin)] if label is not None}
 
 
 @expose
@@ -147,7 +284,7 @@ def info(
     _import(package, plugin)
 
     try:
-        plugin_info = _PLUGINS[package][plugin]
+        funcs_by_label = _BY_LABEL[(package, plugin)]
     except KeyError:
         raise _exceptions.UnknownPluginError(
             f"Could not find any plug-in named {plugin!r} inside {package!r}. "
@@ -155,10 +292,10 @@ def info(
         )
 
     if func is None:
-        func = next(iter(funcs(package, plugin, label=label) + [""]))
+        func = next(iter(funcs_by_label.get(label, [])), "")
 
     try:
-        func_info = plugin_info[func]
+        func_info = _PLUGINS[(package, plugin, func)]
     except KeyError:
         raise _exceptions.UnknownPluginFunctionError(
             f"Could not find any function named {func!r} inside '{package}.{plugin}'. "
@@ -177,15 +314,26 @@ def info(
 @expose
 def exists(package: str, plugin: str) -> bool:
     """Check if a given plugin exists"""
-    if package in _PLUGINS and plugin in _PLUGINS[package]:
+    if (package, plugin) in _BY_PLUGIN:
         return True
+    if (package, plugin) in _IMPORTED:
+        return False
 
+    # Look for the plugin file without running any plugin code
+    plugin_module = f"{package}.{plugin}"
     try:
-        _import(package, plugin)
-    except (_exceptions.UnknownPluginError, _exceptions.UnknownPackageError):
+        spec = importlib.util.find_spec(plugin_module)
+    except ModuleNotFoundError as err:
+        if err.name == plugin_module:
+            return False  # The package is a module, so it has no plugins
+        if package == err.name or package.startswith(f"{err.name}."):
+            return False  # The package does not exist
+        raise
+    if spec is None:
         return False
-    else:
-        return package in _PLUGINS and plugin in _PLUGINS[package]
+
+    _import(package, plugin)
+    return (package, plugin) in _BY_PLUGIN
 
 
 @expose
@@ -193,7 +341,7 @@ def get(
     package: str, plugin: str, func: Optional[str] = None, label: Optional[str] = None
 ) -> Plugin:
     """Get a given plugin"""
-    return info(package, plugin, func=func, label=label).func
+    return _resolve(package, plugin, func, label)
 
 
 @expose
@@ -206,88 +354,288 @@ def call(
     **kwargs: Any,
 ) -> Any:
     """Call the given plugin"""
-    plugin_func = get(package, plugin, func=func, label=label)
+    try:
+        plugin_func = _FUNC_CACHE[(package, plugin, func, label)]
+    except KeyError:
+        plugin_func = _resolve(package, plugin, func, label)
     return plugin_func(*args, **kwargs)
 
 
+def _resolve(
+    package: str, plugin: str, func: Optional[str], label: Optional[str]
+) -> Plugin:
+    """Look up a plugin function, caching the result for repeated calls"""
+    key = (package, plugin, func, label)
+    try:
+        return _FUNC_CACHE[key]
+    except KeyError:
+        plugin_func = _FUNC_CACHE[key] = info(package, plugin, func, label).func
+        return plugin_func
+
+
 def _import(package: str, plugin: str) -> None:
     """Import the given plugin file from a package"""
-    if package in _PLUGINS and plugin in _PLUGINS[package]:
+    if (package, plugin) in _IMPORTED:
         return
 
+    # Modules imported outside of PyPlugs don't need the import machinery
     plugin_module = f"{package}.{plugin}"
+    if plugin_module in sys.modules:
+        _IMPORTED.add((package, plugin))
+        return
+
     try:
         importlib.import_module(plugin_module)
     except ImportError as err:
-        if repr(plugin_module) in err.msg:  # type: ignore
+        if err.name == plugin_module:
             raise _exceptions.UnknownPluginError(
                 f"Plugin {plugin!r} not found in {package!r}"
             ) from None
-        elif repr(package) in err.msg:  # type: ignore
+        elif err.name == package:
             raise _exceptions.UnknownPackageError(
                 f"Package {package!r} does not exist"
             ) from None
         raise
+    _IMPORTED.add((package, plugin))
 
 
 def _import_all(package: str) -> None:
     """Import all plugins in a package"""
-    try:
-        all_resources = resources.contents(package)  # type: ignore
-    except ImportError as err:
-        raise _exceptions.UnknownPackageError(err) from None
-
-    # Note that we have tried to import the package by adding it to _PLUGINS
-    _PLUGINS.setdefault(package, {})
+    if package in _IMPORTED_PACKAGES:
+        return
 
-    # Loop through all Python files in the directories of the package
-    plugins = [
-        r[:-3] for r in all_resources if r.endswith(".py") and not r.startswith("_")
-    ]
+    plugins = [p for p in _discover(package) if (package, p) not in _IMPORTED]
     for plugin in plugins:
         try:
             _import(package, plugin)
         except ImportError:
             pass  # Don't let errors in one plugin, affect the others
+    _IMPORTED_PACKAGES.add(package)
+
+
+def _invalidate(package: str) -> None:
+    """Forget cached discovery results for a package
+
+    Use this to pick up plugin files that have been added to a package after
+    it was first scanned, for instance in tests.
+    """
+    _CANDIDATES.pop(package, None)
+    _NAMES_CACHE.pop(package, None)
+    _IMPORTED_PACKAGES.discard(package)
+    importlib.invalidate_caches()
+
+
+def _discover(package: str) -> List[str]:
+    """Find names of all plugin files in a package, without importing them"""
+    if package in _CANDIDATES:
+        return _CANDIDATES[package]
+
+    # Loop through all Python files in the directories of the package
+    plugins: List[str] = []
+    append = plugins.append
+    for directory in _package_paths(package):
+        if not os.path.isdir(directory):
+            # Packages imported from zip files can not be scanned as directories
+            for _, name, is_package in pkgutil.iter_modules([directory]):
+                if name[0] != "_" and not is_package:
+                    append(sys.intern(name))
+            continue
+
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Check names first, is_file() may need to stat() the entry
+                name = entry.name
+                if name[0] == "_" or not name.endswith(".py"):
+                    continue
+                if entry.is_file():
+                    append(sys.intern(name[:-3]))
+    _CANDIDATES[package] = plugins
+    return plugins
+
+
+def _sort_values(package: str) -> Dict[str, float]:
+    """Find the sort value of all plugins in a package
+
+    If a cache directory is configured, the sort values are read from the cache
+    as long as none of the plugin files have changed. Otherwise, all plugins in
+    the package are imported and the cache is updated. Plugins registered in the
+    current session are always included.
+    """
+    if _CACHE_DIR is None:
+        _import_all(package)
+        return _registered_sort_values(package)
+
+    cache_path = _CACHE_DIR / f"{package}.json"
+    cache_key = _cache_key(package)
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cache["key"] == cache_key:
+            cached_values: Dict[str, float] = cache["sort_values"]
+            return {**cached_values, **_registered_sort_values(package)}
+    except (OSError, ValueError, KeyError):
+        pass  # Missing or broken cache files are recreated below
+
+    _import_all(package)
+    sort_values = _registered_sort_values(package)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(
+            json.dumps({"key": cache_key, "sort_values": sort_values}),
+            encoding="utf-8",
+        )
+    except OSError:
+        pass  # Caching is only an optimization, don't fail if it's not possible
+    return sort_values
+
+
+def _registered_sort_values(package: str) -> Dict[str, float]:
+    """Find the sort value of all registered plugins in a package
+
+    The sort value of a plugin is the sort value of its default function, that is
+    the first registered function without a label. Plugins where all functions
+    have labels use their first registered function instead.
+    """
+    sort_values: Dict[str, float] = {}
+    for (pkg, plugin), func_names in _BY_PLUGIN.items():
+        if pkg == package:
+            default_func = (_BY_LABEL[(pkg, plugin)].get(None) or func_names)[0]
+            sort_values[plugin] = _PLUGINS[(pkg, plugin, default_func)].sort_value
+    return sort_values
+
+
+def _cache_key(package: str) -> str:
+    """Identify the current version of the plugin files in a package"""
+    key = hashlib.blake2b(f"{pyplugs.__version__}:{package}".encode())
+    for directory in _package_paths(package):
+        key.update(f"{directory}:".encode())
+        if not os.path.isdir(directory):
+            # Use the zip file the package is imported from to identify its version
+            for archive in pathlib.Path(directory).parents:
+                if archive.is_file():
+                    key.update(f"{archive}:{archive.stat().st_mtime_ns}".encode())
+                    break
+            continue
+
+        for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+            if entry.name.endswith(".py"):
+                key.update(f"{entry.name}:{entry.stat().st_mtime_ns}".encode())
+    return key.hexdigest()
+
+
+def _package_paths(package: str) -> List[str]:
+    """Find the directories of a package"""
+    pkg = sys.modules.get(package)
+    if pkg is None:
+        try:
+            pkg = importlib.import_module(package)
+        except ImportError as err:
+            raise _exceptions.UnknownPackageError(err) from None
+
+    paths = getattr(pkg, "__path__", None)
+    if paths is None:
+        raise _exceptions.UnknownPackageError(f"{package!r} is not a package")
+    return list(paths)
 
 
 @expose
-def names_factory(package: str) -> Callable[[], List[str]]:
+def names_factory(package: str) -> Callable[[], Sequence[str]]:
     """Create a names() function for one package"""
-    return functools.partial(names, package)
+
+    def package_names(lazy: bool = False) -> Sequence[str]:
+        """List all plug-ins in the package"""
+        return names(package, lazy=lazy)
+
+    return package_names
 
 
 @expose
 def funcs_factory(package: str) -> Callable[[str], List[str]]:
     """Create a funcs() function for one package"""
-    return functools.partial(funcs, package)
+
+    def package_funcs(plugin: str, label: Optional[str] = None) -> List[str]:
+        """List all functions in one plug-in in the package"""
+        return funcs(package, plugin, label=label)
+
+    return package_funcs
 
 
 @expose
 def labels_factory(package: str) -> Callable[[str], Set[str]]:
     """Create a labels() function for one package"""
-    return functools.partial(labels, package)
+
+    def package_labels(plugin: str) -> Set[str]:
+        """List all labels in one plug-in in the package"""
+        return labels(package, plugin)
+
+    return package_labels
 
 
 @expose
 def info_factory(package: str) -> Callable[[str, Optional[str]], PluginInfo]:
     """Create a info() function for one package"""
-    return functools.partial(info, package)
+
+    def package_info(
+        plugin: str, func: Optional[str] = None, label: Optional[str] = None
+    ) -> PluginInfo:
+        """Get information about a plug-in in the package"""
+        return info(package, plugin, func=func, label=label)
+
+    return package_info
 
 
 @expose
 def exists_factory(package: str) -> Callable[[str], bool]:
     """Create an exists() function for one package"""
-    return functools.partial(exists, package)
+
+    def package_exists(plugin: str) -> bool:
+        """Check if a given plugin exists in the package"""
+        return exists(package, plugin)
+
+    return package_exists
 
 
 @expose
 def get_factory(package: str) -> Callable[[str, Optional[str]], Plugin]:
     """Create a get() function for one package"""
-    return functools.partial(get, package)
+
+    def package_get(
+        plugin: str, func: Optional[str] = None, label: Optional[str] = None
+    ) -> Plugin:
+        """Get a given plugin in the package"""
+        return _resolve(package, plugin, func, label)
+
+    return package_get
 
 
 @expose
 def call_factory(package: str) -> Callable[..., Any]:
     """Create a call() function for one package"""
-    return functools.partial(call, package)
+
+    def package_call(
+        plugin: str,
+        func: Optional[str] = None,
+        label: Optional[str] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Call the given plugin in the package"""
+        return _resolve(package, plugin, func, label)(*args, **kwargs)
+
+    return package_call
+
+
+@expose
+def make_dir(*names: str) -> Callable[[], List[str]]:
+    """Create a __dir__() function listing the given names, for plug-in modules
+
+    Add `__dir__ = pyplugs.make_dir("plugin_one", "plugin_two")` to a plug-in
+    module to let dir() return a precomputed list instead of walking the module
+    namespace (PEP 562).
+    """
+    dir_names = sorted(names)
+
+    def module_dir() -> List[str]:
+        """List the public names of the plug-in module"""
+        return list(dir_names)
+
+    return module_dir
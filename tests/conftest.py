@@ -0,0 +1,111 @@
+"""Shared fixtures for the PyPlugs tests
+
+Pytest discovers the fixtures in this file automatically.
+"""
+# Standard library imports
+import copy
+import functools
+import sys
+import types
+
+# Third party imports
+import pytest
+
+# PyPlugs imports
+import pyplugs
+
+# Name of the test plugin package, computed once per test session
+_PLUGIN_PACKAGE = f"{__package__}.plugin_directory"
+
+# Registries in PyPlugs that are changed when plugins are registered
+_REGISTRIES = (
+    "_PLUGINS",
+    "_BY_PLUGIN",
+    "_BY_LABEL",
+    "_IMPORTED",
+    "_IMPORTED_PACKAGES",
+    "_CANDIDATES",
+    "_NAMES_CACHE",
+    "_MODULE_NAMES",
+    "_FUNC_CACHE",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _info(package, plugin, **options):
+    """Information about a plugin, looked up once per test session"""
+    return pyplugs.info(package, plugin, **options)
+
+
+@pytest.fixture(scope="session")
+def plugin_package():
+    """Name of the test plugin package"""
+    return _PLUGIN_PACKAGE
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_plugin_cache():
+    """Import and register all test plugins once before the tests run"""
+    for plugin_name in pyplugs.names(_PLUGIN_PACKAGE):
+        pyplugs.funcs(_PLUGIN_PACKAGE, plugin_name)
+
+
+@pytest.fixture(scope="session")
+def plugin_names(plugin_package):
+    """Names of the plugins in the test plugin package"""
+    return pyplugs.names(plugin_package)
+
+
+@pytest.fixture(scope="session")
+def factories(plugin_package):
+    """All plugin factories for the test plugin package"""
+    return types.SimpleNamespace(
+        names=pyplugs.names_factory(plugin_package),
+        funcs=pyplugs.funcs_factory(plugin_package),
+        labels=pyplugs.labels_factory(plugin_package),
+        info=pyplugs.info_factory(plugin_package),
+        exists=pyplugs.exists_factory(plugin_package),
+        get=pyplugs.get_factory(plugin_package),
+        call=pyplugs.call_factory(plugin_package),
+    )
+
+
+@pytest.fixture(scope="session")
+def pyplugs_snapshot(plugin_package):
+    """Expected results of the pyplugs functions for the test plugin package"""
+    return {
+        "names": pyplugs.names(plugin_package),
+        "funcs_parts": pyplugs.funcs(plugin_package, "plugin_parts"),
+        "labels_labels": pyplugs.labels(plugin_package, "plugin_labels"),
+        "info_parts": pyplugs.info(plugin_package, plugin="plugin_parts"),
+        "get_parts": pyplugs.get(plugin_package, plugin="plugin_parts"),
+        "call_parts": pyplugs.call(plugin_package, plugin="plugin_parts"),
+    }
+
+
+@pytest.fixture(scope="session")
+def info_cache():
+    """Look up plugin information, caching the result between tests"""
+    return _info
+
+
+@pytest.fixture
+def register_plugin(monkeypatch):
+    """Register plugins at runtime, restoring all PyPlugs registries afterwards"""
+    for registry in _REGISTRIES:
+        registry_copy = copy.deepcopy(getattr(pyplugs._plugins, registry))
+        monkeypatch.setattr(pyplugs._plugins, registry, registry_copy)
+
+    def register(module_name, return_value, **options):
+        """Register a plugin function named after its plugin module"""
+        monkeypatch.setitem(sys.modules, module_name, types.ModuleType(module_name))
+
+        def plugin_func():
+            """A plugin function registered at runtime"""
+            return return_value
+
+        plugin_func.__module__ = module_name
+        plugin_func.__name__ = module_name.rpartition(".")[-1]
+        return pyplugs.register(plugin_func, **options)
+
+    return register
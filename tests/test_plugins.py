@@ -3,7 +3,14 @@
 Based on the Pytest test runner
 """
 # Standard library imports
+import copy
+import importlib
 import pathlib
+import pickle
+import sys
+import textwrap
+import types
+import zipfile
 
 # Third party imports
 import pytest
@@ -11,23 +18,15 @@ import pytest
 # PyPlugs imports
 import pyplugs
 
+# Directory with the test plugins, the tests are skipped if it is missing
+_PKG_DIR = pathlib.Path(__file__).parent / "plugin_directory"
+pytestmark = pytest.mark.skipif(
+    not _PKG_DIR.is_dir(), reason="plugin_directory missing"
+)
 
-@pytest.fixture
-def tmpfile(tmpdir):
-    """A temporary file that can be read"""
-    file_path = tmpdir.join("test")
-    file_path.write("Temporary test file")
-
-    return file_path
-
-
-@pytest.fixture
-def plugin_package():
-    """Name of the test plugin package"""
-    plugins = pathlib.Path(__file__).parent / "plugin_directory"
-    relative = plugins.relative_to(pathlib.Path.cwd())
-
-    return ".".join(relative.parts)
+# Expected labels in the test plugins
+_EXPECTED_LABELS = frozenset({"label", "another_label"})
+_EMPTY = frozenset()
 
 
 #
@@ -66,13 +65,13 @@ def test_list_funcs_with_label(plugin_package):
 def test_list_labels(plugin_package):
     """Test that labels() can list all labels in a package"""
     labels = pyplugs.labels(plugin_package, "plugin_labels")
-    assert labels == {"label", "another_label"}
+    assert labels == _EXPECTED_LABELS
 
 
 def test_list_labels_empty(plugin_package):
     """Test that labels() correctly list no labels for unlabeled plugins"""
     labels = pyplugs.labels(plugin_package, "plugin_parts")
-    assert labels == set()
+    assert labels == _EMPTY
 
 
 def test_package_non_existing():
@@ -81,28 +80,95 @@ def test_package_non_existing():
         pyplugs.names("pyplugs.non_existent")
 
 
-def test_plugin_exists(plugin_package):
+def test_package_is_module():
+    """Test that a module that is not a package raises an appropriate error"""
+    with pytest.raises(pyplugs.UnknownPackageError):
+        pyplugs.names("pyplugs._plugins")
+
+
+def test_plugin_exists(plugin_package, plugin_names):
     """Test that an existing plugin returns its own plugin name"""
-    plugin_name = pyplugs.names(plugin_package)[0]
+    plugin_name = plugin_names[0]
     assert pyplugs.info(plugin_package, plugin_name).plugin_name == plugin_name
 
 
-@pytest.mark.parametrize("plugin_name", ["no_plugins", "non_existent"])
-def test_plugin_not_exists(plugin_package, plugin_name):
-    """Test that a non-existing plugin raises UnknownPluginError
+@pytest.mark.parametrize(
+    "fn, args, kwargs, exc",
+    [
+        # Plugin module without any plugin functions
+        (pyplugs.info, ("no_plugins",), {}, pyplugs.UnknownPluginError),
+        # Plugin module that does not exist
+        (pyplugs.info, ("non_existent",), {}, pyplugs.UnknownPluginError),
+        # Label that no plugin function has
+        (
+            pyplugs.info,
+            ("plugin_labels",),
+            {"label": "wrong_label"},
+            pyplugs.UnknownPluginFunctionError,
+        ),
+        # Function that exists, but with a different label
+        (
+            pyplugs.info,
+            ("plugin_labels",),
+            {"func": "plugin_one", "label": "label"},
+            pyplugs.UnknownPluginFunctionError,
+        ),
+        # Plugin function that does not exist
+        (
+            pyplugs.call,
+            ("plugin_parts",),
+            {"func": "non_existent"},
+            pyplugs.UnknownPluginFunctionError,
+        ),
+    ],
+    ids=[
+        "no_plugins",
+        "non_existent",
+        "wrong_label",
+        "func_with_wrong_label",
+        "non_existent_func",
+    ],
+)
+def test_error_cases(plugin_package, fn, args, kwargs, exc):
+    """Test that unknown plugins and plugin functions raise proper errors"""
+    with pytest.raises(exc):
+        fn(plugin_package, *args, **kwargs)
+
+
+def test_plugin_with_import_error(plugin_package):
+    """Test that import errors inside a plugin are not hidden as unknown plugins"""
+    with pytest.raises(ImportError) as err:
+        pyplugs.info(plugin_package, "plugin_with_import_error")
+    assert not isinstance(err.value, pyplugs.PyPlugsException)
+    assert err.value.name == "non_existent_package"
+
+
+def test_info(plugin_package, info_cache):
+    """Test that the info gives information about a plugin"""
+    plugin_info = info_cache(plugin_package, "plugin_plain")
+    assert isinstance(plugin_info, pyplugs.PluginInfo)
+    assert plugin_info.func() == "plain"
 
-    Tests both for an existing module (no_plugins) and a non-existent module
-    (non_existent).
-    """
-    with pytest.raises(pyplugs.UnknownPluginError):
-        pyplugs.info(plugin_package, plugin_name)
 
+def test_info_is_read_only(plugin_package):
+    """Test that plugin information can not be changed"""
+    plugin_info = pyplugs.info(plugin_package, "plugin_plain")
+    with pytest.raises(AttributeError):
+        plugin_info.label = "new_label"
 
-def test_info(plugin_package):
-    """Test that the info gives information about a plugin"""
+
+@pytest.mark.parametrize(
+    "round_trip",
+    [copy.copy, copy.deepcopy, lambda obj: pickle.loads(pickle.dumps(obj))],
+    ids=["copy", "deepcopy", "pickle"],
+)
+def test_info_round_trip(plugin_package, round_trip):
+    """Test that plugin information can be copied and pickled"""
     plugin_info = pyplugs.info(plugin_package, "plugin_plain")
-    assert isinstance(plugin_info, pyplugs.PluginInfo)
-    assert plugin_info.func() == "plain"
+    assert plugin_info.description == "A plain plugin"
+    plugin_copy = round_trip(plugin_info)
+    assert plugin_copy == plugin_info
+    assert plugin_copy.doc == plugin_info.doc
 
 
 def test_info_with_label(plugin_package):
@@ -112,40 +178,59 @@ def test_info_with_label(plugin_package):
     assert plugin_info.func_name == "plugin_first_label"
 
 
-def test_info_with_wrong_label(plugin_package):
-    """Test that info() raises error when label is wrong"""
-    with pytest.raises(pyplugs.UnknownPluginFunctionError):
-        pyplugs.info(plugin_package, "plugin_labels", label="wrong_label")
+@pytest.mark.parametrize(
+    "plugin_name, expected",
+    [("plugin_parts", True), ("no_plugins", False), ("non_existent", False)],
+)
+def test_exists(plugin_package, plugin_name, expected):
+    """Test that exists() function correctly identifies existing plugins"""
+    assert pyplugs.exists(plugin_package, plugin_name) is expected
+
+
+def test_exists_on_non_existing_package():
+    """Test that exists() correctly returns False for non-existing packages"""
+    assert pyplugs.exists("non_existent_package", "plugin_parts") is False
+    assert pyplugs.exists("non_existent_package", "non_existent") is False
 
 
-def test_info_with_function_with_wrong_label(plugin_package):
-    """Test that info() is strict about matching label to function"""
-    with pytest.raises(pyplugs.UnknownPluginFunctionError):
-        pyplugs.info(plugin_package, "plugin_labels", func="plugin_one", label="label")
+def test_exists_on_module():
+    """Test that exists() correctly returns False for modules that are not packages"""
+    assert pyplugs.exists("pyplugs._plugins", "non_existent") is False
 
 
-def test_info_with_no_plugins(plugin_package):
-    """Test that info() raises a proper error when there are no plugins available"""
-    with pytest.raises(pyplugs.UnknownPluginError):
-        pyplugs.info(plugin_package, "no_plugins")
+def test_exists_with_broken_package(tmp_path, monkeypatch):
+    """Test that exists() does not hide import errors inside a package"""
+    package_dir = tmp_path / "broken_package"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("import not_installed_dependency\n")
+    (package_dir / "plugin_parts.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    with pytest.raises(ModuleNotFoundError) as err:
+        pyplugs.exists("broken_package", "plugin_parts")
+    assert err.value.name == "not_installed_dependency"
 
 
-def test_exists(plugin_package):
-    """Test that exists() function correctly identifies existing plugins"""
+def test_exists_before_import(plugin_package, monkeypatch):
+    """Test that exists() finds plugins that have not been imported yet"""
+    monkeypatch.setattr(pyplugs._plugins, "_PLUGINS", {})
+    monkeypatch.setattr(pyplugs._plugins, "_BY_PLUGIN", {})
+    monkeypatch.setattr(pyplugs._plugins, "_BY_LABEL", {})
+    monkeypatch.setattr(pyplugs._plugins, "_IMPORTED", set())
+    monkeypatch.delitem(sys.modules, f"{plugin_package}.plugin_parts")
+    monkeypatch.delitem(sys.modules, f"{plugin_package}.no_plugins")
     assert pyplugs.exists(plugin_package, "plugin_parts") is True
     assert pyplugs.exists(plugin_package, "no_plugins") is False
-    assert pyplugs.exists(plugin_package, "non_existent") is False
 
 
-def test_exists_on_non_existing_package():
-    """Test that exists() correctly returns False for non-existing packages"""
-    assert pyplugs.exists("non_existent_package", "plugin_parts") is False
-    assert pyplugs.exists("non_existent_package", "non_existent") is False
+def test_info_on_non_existing_package():
+    """Test that info() raises an appropriate error for non-existing packages"""
+    with pytest.raises(pyplugs.UnknownPackageError):
+        pyplugs.info("non_existent_package", "plugin_parts")
 
 
-def test_call_existing_plugin(plugin_package):
+def test_call_existing_plugin(plugin_package, plugin_names):
     """Test that calling a test-plugin works, and returns a string"""
-    plugin_name = pyplugs.names(plugin_package)[0]
+    plugin_name = plugin_names[0]
     return_value = pyplugs.call(plugin_package, plugin_name)
     assert isinstance(return_value, str)
 
@@ -161,99 +246,337 @@ def test_call_with_label(plugin_package):
     assert pyplugs.call(plugin_package, "plugin_labels", label="label") == "first"
 
 
-def test_ordered_plugin(plugin_package):
+def test_ordered_plugin(plugin_names):
     """Test that order of plugins can be customized"""
-    plugin_names = pyplugs.names(plugin_package)
     assert plugin_names[0] == "plugin_first"
     assert plugin_names[-1] == "plugin_last"
 
 
-def test_default_part(plugin_package):
+def test_default_part(plugin_package, pyplugs_snapshot):
     """Test that first registered function in a plugin is called by default"""
     plugin_name = "plugin_parts"
-    default = pyplugs.call(plugin_package, plugin_name)
+    default = pyplugs_snapshot["call_parts"]
     explicit = pyplugs.call(plugin_package, plugin_name, func="plugin_default")
     assert default == explicit
 
 
-def test_call_non_existing_func(plugin_package):
-    """Test that calling a non-existing plug-in function raises an error"""
-    plugin_name = "plugin_parts"
-    func_name = "non_existent"
-    with pytest.raises(pyplugs.UnknownPluginFunctionError):
-        pyplugs.call(plugin_package, plugin_name, func=func_name)
-
-
-def test_short_doc(plugin_package):
+def test_short_doc(plugin_package, info_cache):
     """Test that we can retrieve the short docstring from a plugin"""
     plugin_name = "plugin_plain"
-    doc = pyplugs.info(plugin_package, plugin_name).description
+    doc = info_cache(plugin_package, plugin_name).description
     assert doc == "A plain plugin"
 
 
-def test_long_doc(plugin_package):
+def test_long_doc(plugin_package, info_cache):
     """Test that we can retrieve the long docstring from a plugin"""
     plugin_name = "plugin_plain"
-    doc = pyplugs.info(plugin_package, plugin_name).doc
+    doc = info_cache(plugin_package, plugin_name).doc
     assert doc == "This is the plain docstring."
 
 
-def test_names_factory(plugin_package):
+def test_long_doc_empty(plugin_package):
+    """Test that the long docstring is empty for a one-line docstring"""
+    plugin_info = pyplugs.info(plugin_package, "plugin_parts")
+    assert plugin_info.description == plugin_info.func.__doc__
+    assert plugin_info.doc == ""
+
+
+def test_module_doc(plugin_package):
+    """Test that we can retrieve the module docstring of a plugin"""
+    plugin_name = "plugin_plain"
+    doc = pyplugs.info(plugin_package, plugin_name).module_doc
+    assert doc.strip() == "Module doc-string"
+
+
+def test_names_factory(factories, pyplugs_snapshot):
     """Test that the names factory can retrieve names in package"""
-    names = pyplugs.names_factory(plugin_package)
-    factory_names = names()
-    pyplugs_names = pyplugs.names(plugin_package)
+    factory_names = factories.names()
+    pyplugs_names = pyplugs_snapshot["names"]
     assert factory_names == pyplugs_names
 
 
-def test_funcs_factory(plugin_package):
+def test_funcs_factory(factories, pyplugs_snapshot):
     """Test that the funcs factory can retrieve funcs within plugin"""
     plugin_name = "plugin_parts"
-    funcs = pyplugs.funcs_factory(plugin_package)
-    factory_funcs = funcs(plugin_name)
-    pyplugs_funcs = pyplugs.funcs(plugin_package, plugin_name)
+    factory_funcs = factories.funcs(plugin_name)
+    pyplugs_funcs = pyplugs_snapshot["funcs_parts"]
     assert factory_funcs == pyplugs_funcs
 
 
-def test_labels_factory(plugin_package):
+def test_labels_factory(factories, pyplugs_snapshot):
     """Test that the labels factory can retrieve labels within plugin"""
     plugin_name = "plugin_labels"
-    labels = pyplugs.labels_factory(plugin_package)
-    factory_labels = labels(plugin_name)
-    pyplugs_labels = pyplugs.labels(plugin_package, plugin_name)
+    factory_labels = factories.labels(plugin_name)
+    pyplugs_labels = pyplugs_snapshot["labels_labels"]
     assert factory_labels == pyplugs_labels
 
 
-def test_info_factory(plugin_package):
+def test_info_factory(factories, pyplugs_snapshot):
     """Test that the info factory can retrieve info in package"""
     plugin_name = "plugin_parts"
-    info = pyplugs.info_factory(plugin_package)
-    factory_info = info(plugin_name)
-    pyplugs_info = pyplugs.info(plugin_package, plugin=plugin_name)
+    factory_info = factories.info(plugin_name)
+    pyplugs_info = pyplugs_snapshot["info_parts"]
     assert factory_info == pyplugs_info
 
 
-def test_exists_factory(plugin_package):
+def test_exists_factory(factories):
     """Test that the exists factory can check for plugins in a package"""
-    exists = pyplugs.exists_factory(plugin_package)
-    assert exists("plugin_parts") is True
-    assert exists("no_plugins") is False
-    assert exists("non_existent") is False
+    assert factories.exists("plugin_parts") is True
+    assert factories.exists("no_plugins") is False
+    assert factories.exists("non_existent") is False
 
 
-def test_get_factory(plugin_package):
+def test_get_factory(factories, pyplugs_snapshot):
     """Test that the get factory can retrieve get in package"""
     plugin_name = "plugin_parts"
-    get = pyplugs.get_factory(plugin_package)
-    factory_get = get(plugin_name)
-    pyplugs_get = pyplugs.get(plugin_package, plugin=plugin_name)
+    factory_get = factories.get(plugin_name)
+    pyplugs_get = pyplugs_snapshot["get_parts"]
     assert factory_get == pyplugs_get
 
 
-def test_call_factory(plugin_package):
+def test_call_factory(factories, pyplugs_snapshot):
     """Test that the call factory can retrieve call in package"""
     plugin_name = "plugin_parts"
-    call = pyplugs.call_factory(plugin_package)
-    factory_call = call(plugin_name)
-    pyplugs_call = pyplugs.call(plugin_package, plugin=plugin_name)
+    factory_call = factories.call(plugin_name)
+    pyplugs_call = pyplugs_snapshot["call_parts"]
     assert factory_call == pyplugs_call
+
+
+def test_plugin_imported_only_once(plugin_package, monkeypatch):
+    """Test that a plugin which has been imported is not imported again"""
+    pyplugs.call(plugin_package, "plugin_parts")
+
+    def fail_import(name):
+        """Fail if plugin is imported a second time"""
+        raise AssertionError(f"{name} imported twice")
+
+    monkeypatch.setattr(pyplugs._plugins.importlib, "import_module", fail_import)
+    assert pyplugs.call(plugin_package, "plugin_parts") == "default"
+
+
+def test_register_invalidates_resolved_plugins(register_plugin):
+    """Test that re-registering a plugin function is picked up by get()"""
+    register_plugin("dynamic_package.plugin_dynamic", "first version")
+    assert pyplugs.call("dynamic_package", "plugin_dynamic") == "first version"
+
+    register_plugin("dynamic_package.plugin_dynamic", "second version")
+    assert pyplugs.call("dynamic_package", "plugin_dynamic") == "second version"
+
+
+def test_names_lazy(plugin_package):
+    """Test that names() can list plugin files without importing them"""
+    plugins = pyplugs.names(plugin_package, lazy=True)
+    assert list(plugins) == sorted(plugins)
+    assert "plugin_parts" in plugins
+    assert "plugin_with_import_error" in plugins
+    assert "__init__" not in plugins
+
+
+def test_names_cached_on_disk(plugin_package, tmp_path, monkeypatch):
+    """Test that names() can be answered from the on-disk cache"""
+    monkeypatch.setattr(pyplugs._plugins, "_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(pyplugs._plugins, "_NAMES_CACHE", {})
+    plugin_names = pyplugs.names(plugin_package)
+    assert (tmp_path / f"{plugin_package}.json").exists()
+
+    def fail_import_all(package):
+        """Fail if plugins are imported instead of read from the cache"""
+        raise AssertionError(f"{package} imported despite cache")
+
+    monkeypatch.setattr(pyplugs._plugins, "_import_all", fail_import_all)
+    monkeypatch.setattr(pyplugs._plugins, "_NAMES_CACHE", {})
+    assert pyplugs.names(plugin_package) == plugin_names
+
+
+def test_names_disk_cache_sees_new_plugins(
+    plugin_package, register_plugin, tmp_path, monkeypatch
+):
+    """Test that plugins registered at runtime are listed with the on-disk cache"""
+    monkeypatch.setattr(pyplugs._plugins, "_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(pyplugs._plugins, "_NAMES_CACHE", {})
+    pyplugs.names(plugin_package)
+    assert (tmp_path / f"{plugin_package}.json").exists()
+
+    register_plugin(f"{plugin_package}.plugin_dynamic", "dynamic", sort_value=100)
+    assert pyplugs.names(plugin_package)[-1] == "plugin_dynamic"
+
+
+def test_names_broken_disk_cache(plugin_package, tmp_path, monkeypatch):
+    """Test that a broken on-disk cache is ignored and recreated"""
+    cache_path = tmp_path / f"{plugin_package}.json"
+    cache_path.write_text("Not a valid cache")
+    monkeypatch.setattr(pyplugs._plugins, "_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(pyplugs._plugins, "_NAMES_CACHE", {})
+    assert pyplugs.names(plugin_package)[0] == "plugin_first"
+    assert "sort_values" in cache_path.read_text()
+
+
+def test_names_unwritable_disk_cache(plugin_package, tmp_path, monkeypatch):
+    """Test that names() works even if the on-disk cache can not be written"""
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("Blocks the cache directory")
+    monkeypatch.setattr(pyplugs._plugins, "_CACHE_DIR", not_a_directory)
+    monkeypatch.setattr(pyplugs._plugins, "_NAMES_CACHE", {})
+    assert pyplugs.names(plugin_package)[0] == "plugin_first"
+
+
+def test_package_non_existing_with_disk_cache(tmp_path, monkeypatch):
+    """Test that a non-existent package raises an error when caching on disk"""
+    monkeypatch.setattr(pyplugs._plugins, "_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(pyplugs._plugins, "_NAMES_CACHE", {})
+    with pytest.raises(pyplugs.UnknownPackageError):
+        pyplugs.names("pyplugs.non_existent")
+
+
+def test_names_sees_new_plugins(plugin_package, register_plugin):
+    """Test that names() is updated when new plugins are registered"""
+    assert "plugin_dynamic" not in pyplugs.names(plugin_package)
+
+    register_plugin(f"{plugin_package}.plugin_dynamic", "dynamic", sort_value=100)
+    assert pyplugs.names(plugin_package)[-1] == "plugin_dynamic"
+
+
+def test_names_returns_shared_tuple(plugin_package):
+    """Test that names() returns the same immutable tuple on repeated calls"""
+    plugin_names = pyplugs.names(plugin_package)
+    assert isinstance(plugin_names, tuple)
+    assert pyplugs.names(plugin_package) is plugin_names
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "\n\n    One line\n    ",
+        "\n\n    First line\n      Indented line\n\n    Last line\n",
+        "\n\n        Deep line\n    Shallow line\n",
+        "\n\n\tFirst line\n\tSecond line\n",
+        "\n\n\t  First line\n\t    Indented line\n",
+    ],
+    ids=["empty", "one_line", "indented_line", "deep_line", "tabs", "tabs_and_spaces"],
+)
+def test_dedent_matches_textwrap(text):
+    """Test that the fast dedent gives the same result as textwrap.dedent()"""
+    assert pyplugs._plugins._dedent(text) == textwrap.dedent(text).strip()
+
+
+def test_names_lazy_only_files(tmp_path, monkeypatch):
+    """Test that directories with names looking like plugin files are ignored"""
+    package_dir = tmp_path / "scandir_package"
+    (package_dir / "not_a_plugin.py").mkdir(parents=True)
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "plugin_file.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    assert pyplugs.names("scandir_package", lazy=True) == ("plugin_file",)
+
+
+@pytest.fixture
+def zip_package(tmp_path, monkeypatch):
+    """A plugin package imported from a zip file"""
+    zip_path = tmp_path / "plugins.zip"
+    with zipfile.ZipFile(zip_path, "w") as zip_file:
+        zip_file.writestr("zip_package/__init__.py", "")
+        zip_file.writestr("zip_package/_private.py", "")
+        zip_file.writestr("zip_package/subpackage/__init__.py", "")
+        zip_file.writestr(
+            "zip_package/plugin_zipped.py",
+            "import pyplugs\n\n@pyplugs.register\ndef plugin_zipped():\n"
+            "    return 'zipped'\n",
+        )
+    monkeypatch.syspath_prepend(str(zip_path))
+    return "zip_package"
+
+
+def test_names_in_zip_file(zip_package):
+    """Test that plugins can be found in packages imported from zip files"""
+    assert pyplugs.names(zip_package, lazy=True) == ("plugin_zipped",)
+    assert pyplugs.names(zip_package) == ("plugin_zipped",)
+    assert pyplugs.call(zip_package, "plugin_zipped") == "zipped"
+
+
+def test_names_in_zip_file_with_disk_cache(zip_package, tmp_path, monkeypatch):
+    """Test that the on-disk cache handles packages imported from zip files"""
+    monkeypatch.setattr(pyplugs._plugins, "_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(pyplugs._plugins, "_NAMES_CACHE", {})
+    assert pyplugs.names(zip_package) == ("plugin_zipped",)
+    assert (tmp_path / "cache" / f"{zip_package}.json").exists()
+
+
+def test_package_imported_only_once(plugin_package, monkeypatch):
+    """Test that plugins in a package are not imported again by names()"""
+    plugin_names = pyplugs.names(plugin_package)
+    monkeypatch.setattr(pyplugs._plugins, "_NAMES_CACHE", {})
+
+    def fail_import(package, plugin):
+        """Fail if a plugin is imported a second time"""
+        raise AssertionError(f"{package}.{plugin} imported twice")
+
+    monkeypatch.setattr(pyplugs._plugins, "_import", fail_import)
+    assert pyplugs.names(plugin_package) == plugin_names
+
+
+def test_invalidate_finds_new_plugins(tmp_path, monkeypatch):
+    """Test that new plugin files are found after invalidating a package"""
+    package_dir = tmp_path / "growing_package"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("")
+    plugin_code = "import pyplugs\n\n@pyplugs.register\ndef {0}():\n    return '{0}'\n"
+    (package_dir / "plugin_a.py").write_text(plugin_code.format("plugin_a"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    assert pyplugs.names("growing_package") == ("plugin_a",)
+
+    (package_dir / "plugin_b.py").write_text(plugin_code.format("plugin_b"))
+    assert pyplugs.names("growing_package") == ("plugin_a",)
+
+    pyplugs._plugins._invalidate("growing_package")
+    assert sorted(pyplugs.names("growing_package")) == ["plugin_a", "plugin_b"]
+
+
+def test_names_sorted_by_default_function(tmp_path, monkeypatch):
+    """Test that plugins are sorted by their default function, not labeled ones"""
+    package_dir = tmp_path / "sorted_package"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "plugin_labeled.py").write_text(
+        "import pyplugs\n\n"
+        "@pyplugs.register(sort_value=5, label='label')\ndef plugin_a():\n    pass\n\n"
+        "@pyplugs.register(sort_value=-5)\ndef plugin_b():\n    pass\n"
+    )
+    (package_dir / "plugin_unlabeled.py").write_text(
+        "import pyplugs\n\n@pyplugs.register\ndef plugin_c():\n    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    assert pyplugs.names("sorted_package") == ("plugin_labeled", "plugin_unlabeled")
+
+
+def test_register_with_new_label(register_plugin):
+    """Test that re-registering a plugin function with a new label moves it"""
+    module_name = "dynamic_package.plugin_relabeled"
+    register_plugin(module_name, "relabeled", label="old_label")
+    assert pyplugs.labels("dynamic_package", "plugin_relabeled") == {"old_label"}
+
+    register_plugin(module_name, "relabeled", label="new_label")
+    assert pyplugs.labels("dynamic_package", "plugin_relabeled") == {"new_label"}
+    assert pyplugs.funcs("dynamic_package", "plugin_relabeled", label="new_label") == [
+        "plugin_relabeled"
+    ]
+
+
+def test_names_with_module_imported_directly(tmp_path, monkeypatch):
+    """Test that names() handles plugin files that are already imported"""
+    package_dir = tmp_path / "direct_package"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "not_registered.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.import_module("direct_package.not_registered")
+
+    assert pyplugs.names("direct_package") == ()
+    assert pyplugs.exists("direct_package", "not_registered") is False
+
+
+def test_make_dir():
+    """Test that make_dir() creates a __dir__() function for a plugin module"""
+    module = types.ModuleType("module_with_dir")
+    module.__dir__ = pyplugs.make_dir("plugin_two", "plugin_one")
+    assert dir(module) == ["plugin_one", "plugin_two"]